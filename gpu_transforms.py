@@ -0,0 +1,100 @@
+import math
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+def to_float(x):
+    # uint8 images are scaled to [0, 1] like torchvision's ToTensor
+    if x.dtype == torch.uint8:
+        return x.float().div_(255.)
+    return x
+
+
+class Normalize(nn.Module):
+    """Batched (img - mean) / std with mean/std kept as device buffers."""
+
+    def __init__(self, mean, std):
+        super().__init__()
+        self.register_buffer('mean', torch.tensor(mean).view(1, -1, 1, 1))
+        self.register_buffer('std', torch.tensor(std).view(1, -1, 1, 1))
+
+    def forward(self, x):
+        return (x - self.mean) / self.std
+
+
+class RandomResizedCropFlip(nn.Module):
+    """Batched RandomResizedCrop + RandomHorizontalFlip + Normalize on device.
+
+    Every sample draws its own crop box and flip, which are expressed as an affine
+    sampling grid so the whole batch is cropped, flipped and resized by a single
+    grid_sample call. Box sampling follows torchvision: up to `num_tries` draws per
+    sample, the first one inside the image wins, otherwise a center crop clamped to
+    the ratio range is used. Unlike torchvision, box sizes are not rounded to pixels.
+    """
+
+    def __init__(self, size, mean, std, scale=(0.08, 1.0), ratio=(3. / 4., 4. / 3.), flip_prob=0.5, num_tries=10):
+        super().__init__()
+        self.size = (size, size) if isinstance(size, int) else tuple(size)
+        self.scale = scale
+        self.ratio = ratio
+        self.log_ratio = (math.log(ratio[0]), math.log(ratio[1]))
+        self.flip_prob = flip_prob
+        self.num_tries = num_tries
+        self.normalize = Normalize(mean, std)
+
+    def fallback_crop(self, h, w):
+        # torchvision's center-crop fallback, as fractions of the source width / height
+        in_ratio = w / h
+        if in_ratio < min(self.ratio):
+            return 1., w / min(self.ratio) / h
+        if in_ratio > max(self.ratio):
+            return h * max(self.ratio) / w, 1.
+        return 1., 1.
+
+    def forward(self, x):
+        x = to_float(x)
+        b, c, h, w = x.shape
+        n = self.num_tries
+        # one device-side draw covers every try's area / ratio plus center x / y and flip for the whole batch
+        u = torch.rand(2 * n + 3, b, device=x.device)
+        area = self.scale[0] + (self.scale[1] - self.scale[0]) * u[:n]
+        ratio = torch.exp(self.log_ratio[0] + (self.log_ratio[1] - self.log_ratio[0]) * u[n:2 * n])
+        # crop width / height of every try as fractions of the source image
+        tries_w = torch.sqrt(area * ratio * h / w)
+        tries_h = torch.sqrt(area / ratio * w / h)
+        valid = (tries_w <= 1.) & (tries_h <= 1.)
+        # argmax returns the first valid try
+        first = valid.to(torch.uint8).argmax(dim=0, keepdim=True)
+        fallback_w, fallback_h = self.fallback_crop(h, w)
+        found = valid.any(dim=0)
+        crop_w = torch.where(found, tries_w.gather(0, first)[0], torch.full_like(found, fallback_w, dtype=x.dtype))
+        crop_h = torch.where(found, tries_h.gather(0, first)[0], torch.full_like(found, fallback_h, dtype=x.dtype))
+        # the fallback is a center crop
+        center_x = torch.where(found, (u[2 * n] * 2. - 1.) * (1. - crop_w), torch.zeros_like(crop_w))
+        center_y = torch.where(found, (u[2 * n + 1] * 2. - 1.) * (1. - crop_h), torch.zeros_like(crop_h))
+        flip = 1. - 2. * (u[2 * n + 2] < self.flip_prob).float()
+
+        theta = torch.zeros(b, 2, 3, device=x.device)
+        theta[:, 0, 0] = crop_w * flip
+        theta[:, 0, 2] = center_x
+        theta[:, 1, 1] = crop_h
+        theta[:, 1, 2] = center_y
+        grid = F.affine_grid(theta, [b, c, *self.size], align_corners=False)
+        x = F.grid_sample(x, grid, mode='bilinear', padding_mode='border', align_corners=False)
+        return self.normalize(x)
+
+
+class ResizeNormalize(nn.Module):
+    """Batched Resize + Normalize on device."""
+
+    def __init__(self, size, mean, std):
+        super().__init__()
+        self.size = (size, size) if isinstance(size, int) else tuple(size)
+        self.normalize = Normalize(mean, std)
+
+    def forward(self, x):
+        x = to_float(x)
+        x = F.interpolate(x, size=self.size, mode='bilinear', align_corners=False)
+        return self.normalize(x)
@@ -1,4 +1,7 @@
 import argparse
+import concurrent.futures
+import copy
+import inspect
 import random
 import time
 import warnings
@@ -6,7 +9,6 @@ import datetime
 
 import torch
 import torch.nn as nn
-import torch.nn.functional as F
 import torch.backends.cudnn as cudnn
 import torch.utils.data
 from torch.utils.tensorboard import SummaryWriter
@@ -25,6 +27,7 @@ import models.mixers_sparse_patchcell_origin
 import models.configs
 import utils
 import models.layers
+import gpu_transforms
 
 from spikingjelly.activation_based import functional, monitor, neuron
 
@@ -36,13 +39,14 @@ from timm.loss import SoftTargetCrossEntropy
 from samplers import RASampler
 
 
-def set_deterministic(_seed_: int = 2022):
+def set_deterministic(_seed_: int = 2022, deterministic: bool = True):
     random.seed(_seed_)
     np.random.seed(_seed_)
     torch.manual_seed(_seed_)
     torch.cuda.manual_seed_all(_seed_)
-    cudnn.deterministic = True
-    cudnn.benchmark = False
+    # input shapes are fixed, so without strict determinism let cuDNN benchmark the fastest conv algorithms
+    cudnn.deterministic = deterministic
+    cudnn.benchmark = not deterministic
 
 
 CONFIG_MAP = {
@@ -60,20 +64,36 @@ class Trainer(object):
                 'config': CONFIG_MAP[args.model_size]
             }
         }
-        set_deterministic(args.seed)
+        set_deterministic(args.seed, args.deterministic)
         if args.output_dir:
             os.makedirs(args.output_dir, exist_ok=True)
+            # keep triton's compiled / autotuned kernels next to the run so later epochs and resumes reuse them
+            os.environ.setdefault('TRITON_CACHE_DIR', os.path.join(args.output_dir, 'triton_cache'))
 
         utils.init_distributed_mode(args)
         print(args)
 
         device = torch.device(args.device)
 
+        self.train_gpu_transform = None
+        self.test_gpu_transform = None
         dataset_train, dataset_test, train_sampler, test_sampler = self.load_data(args)
 
         num_classes = len(dataset_train.classes)
 
+        if self.train_gpu_transform is not None:
+            self.train_gpu_transform.to(device)
+        if self.test_gpu_transform is not None:
+            self.test_gpu_transform.to(device)
+
         args.num_classes = num_classes
+        # one-hot labels for the mse criterion are gathered from this instead of rebuilt every step
+        self._eye = torch.eye(num_classes, device=device)
+
+        # persistent_workers / prefetch_factor are only valid with worker processes
+        loader_kwargs = dict(persistent_workers=True, prefetch_factor=4) if args.workers > 0 else {}
+        if args.device.startswith('cuda'):
+            loader_kwargs['pin_memory_device'] = args.device
 
         dataloader_train = torch.utils.data.DataLoader(
             dataset=dataset_train,
@@ -81,16 +101,18 @@ class Trainer(object):
             sampler=train_sampler,
             num_workers=args.workers,
             pin_memory=True,
-            drop_last=True
+            drop_last=True,
+            **loader_kwargs
         )
 
         dataloader_test = torch.utils.data.DataLoader(
             dataset=dataset_test,
-            batch_size=args.batch_size,
+            batch_size=args.eval_batch_size or args.batch_size * 2,
             sampler=test_sampler,
             num_workers=args.workers,
             pin_memory=True,
-            drop_last=False
+            drop_last=False,
+            **loader_kwargs
         )
 
         mixup_fn = None
@@ -111,7 +133,12 @@ class Trainer(object):
 
         optimizer = self.set_optimizer(args, model.parameters())
 
-        if args.amp:
+        # bf16 needs no loss scaling; GPUs without bf16 support (e.g. V100 / T4) fall back to fp16 + GradScaler
+        if args.amp and self.native_bf16_supported():
+            self.amp_dtype = torch.bfloat16
+        else:
+            self.amp_dtype = torch.float16
+        if args.amp and self.amp_dtype == torch.float16:
             scaler = torch.cuda.amp.GradScaler()
         else:
             scaler = None
@@ -120,9 +147,20 @@ class Trainer(object):
 
         model_without_ddp = model
         if args.distributed:
-            model = torch.nn.parallel.DistributedDataParallel(model, device_ids=[args.gpu])
+            # the unrolled SNN graph is the same every step, which static_graph lets DDP exploit
+            model = torch.nn.parallel.DistributedDataParallel(model, device_ids=[args.gpu],
+                                                              gradient_as_bucket_view=True,
+                                                              static_graph=True,
+                                                              bucket_cap_mb=50)
             model_without_ddp = model.module
 
+        model_compiled = False
+        if args.compile:
+            # model_without_ddp stays uncompiled so checkpoints keep their original state_dict keys
+            compiled_model = self.compile_model(args, model)
+            model_compiled = compiled_model is not model
+            model = compiled_model
+
         log_dir = os.path.join(args.output_dir, self.get_logdir_name(args))
         pt_dir = os.path.join(log_dir, 'pt')
         tb_dir = os.path.join(log_dir, 'tb')
@@ -145,7 +183,7 @@ class Trainer(object):
             optimizer.load_state_dict(checkpoint['optimizer'])
             lr_scheduler.load_state_dict(checkpoint['lr_scheduler'])
             args.start_epoch = checkpoint['epoch'] + 1
-            if scaler:
+            if scaler and 'scaler' in checkpoint:
                 scaler.load_state_dict(checkpoint['scaler'])
 
             if utils.is_main_process():
@@ -186,6 +224,12 @@ class Trainer(object):
 
             return
 
+        self.warmup(args, model, model_without_ddp, optimizer, device, model_compiled)
+
+        # checkpoints are written by a background thread, with at most one write in flight
+        self._ckpt_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._ckpt_future = None
+
         for epoch in range(args.start_epoch, args.epochs):
             start_time = time.time()
             if args.distributed:
@@ -215,37 +259,69 @@ class Trainer(object):
                     "optimizer": optimizer.state_dict(),
                     "lr_scheduler": lr_scheduler.state_dict(),
                     "epoch": epoch,
-                    "args": args,
+                    "args": copy.copy(args),
                     "max_test_acc1": max_test_acc1,
                 }
                 if scaler:
                     checkpoint["scaler"] = scaler.state_dict()
-                utils.save_on_master(checkpoint, os.path.join(pt_dir, "checkpoint_latest.pth"))
-                if save_max_test_acc1:
-                    utils.save_on_master(checkpoint, os.path.join(pt_dir, f"checkpoint_max_test_acc1.pth"))
+                checkpoint = utils.state_to_cpu(checkpoint)
+                if self._ckpt_future is not None:
+                    self._ckpt_future.result()
+                self._ckpt_future = self._ckpt_executor.submit(self.save_checkpoint, checkpoint, pt_dir,
+                                                               save_max_test_acc1)
 
             print(
                 f'escape time={(datetime.datetime.now() + datetime.timedelta(seconds=(time.time() - start_time) * (args.epochs - epoch))).strftime("%Y-%m-%d %H:%M:%S")}\n')
             print(args)
 
+        if self._ckpt_future is not None:
+            self._ckpt_future.result()
+        self._ckpt_executor.shutdown()
+
+    def warmup(self, args, model, model_without_ddp, optimizer, device, model_compiled):
+        # JIT-compile and autotune the triton / inductor kernels once for the fixed training shape,
+        # so the first epoch is not billed for it
+        uses_triton = any(getattr(m, 'backend', None) == 'triton' for m in model_without_ddp.modules())
+        if not (uses_triton or model_compiled):
+            return
+        print('Warming up kernels...')
+        # the warmup batch must not leak into the BN running statistics
+        state = copy.deepcopy(model_without_ddp.state_dict())
+        model.train()
+        img = torch.zeros(args.batch_size, 3, args.input_size, args.input_size, device=device)
+        with torch.autocast('cuda', dtype=self.amp_dtype, enabled=args.amp):
+            output = self.process_model_output(args, model(self.preprocess_train_sample(args, img)))
+        output.float().sum().backward()
+        optimizer.zero_grad(set_to_none=True)
+        functional.reset_net(model)
+        model_without_ddp.load_state_dict(state)
+
+    def save_checkpoint(self, checkpoint, pt_dir, save_max_test_acc1):
+        utils.save_on_master(checkpoint, os.path.join(pt_dir, "checkpoint_latest.pth"))
+        if save_max_test_acc1:
+            utils.save_on_master(checkpoint, os.path.join(pt_dir, f"checkpoint_max_test_acc1.pth"))
+
     def train_one_epoch(self, model, criterion, optimizer, data_loader, device, epoch, args, scaler, mixup_fn):
         model.train()
         metric_logger = utils.MetricLogger(delimiter=' ')
         metric_logger.add_meter('lr', utils.SmoothedValue(window_size=1, fmt='{value}'))
-        metric_logger.add_meter('img/s', utils.SmoothedValue(window_size=10, fmt='{value}'))
 
         header = f'Epoch: [{epoch}]'
-        for i, (img, target) in enumerate(metric_logger.log_every(data_loader, -1, header)):
-            start_time = time.time()
-            img = img.to(device, non_blocking=True)
-            target = target.to(device, non_blocking=True)
-            img, target = mixup_fn(img, target)
-            with torch.cuda.amp.autocast(enabled=scaler is not None):
+        # running sums of loss * batch size and top-1 / top-5 hits, kept on device to avoid a sync every step
+        stats = torch.zeros(3, device=device)
+        num_samples = 0
+        # without per-step syncs only the epoch wall time (read after the final reduce) reflects real throughput
+        start_time = time.time()
+        prefetcher = utils.CUDAPrefetcher(data_loader, device, self.train_gpu_transform)
+        for i, (img, target) in enumerate(metric_logger.log_every(prefetcher, -1, header)):
+            if mixup_fn is not None:
+                img, target = mixup_fn(img, target)
+            with torch.autocast('cuda', dtype=self.amp_dtype, enabled=args.amp):
                 img = self.preprocess_train_sample(args, img)
                 output = self.process_model_output(args, model(img))
                 loss = self.cal_loss(args, criterion, output, target)
 
-            optimizer.zero_grad()
+            optimizer.zero_grad(set_to_none=True)
             if scaler is not None:
                 scaler.scale(loss).backward()
                 if args.clip_grad_norm is not None:
@@ -260,18 +336,23 @@ class Trainer(object):
                 optimizer.step()
             functional.reset_net(model)
 
-            acc1, acc5 = self.cal_acc1_acc5(output, target)
+            correct1, correct5 = self.cal_acc1_acc5(args, output, target)
             batch_size = target.shape[0]
-            metric_logger.update(loss=loss.item(), lr=optimizer.param_groups[0]['lr'])
-            metric_logger.meters['acc1'].update(acc1.item(), n=batch_size)
-            metric_logger.meters['acc5'].update(acc5.item(), n=batch_size)
-            metric_logger.meters['img/s'].update(batch_size / (time.time() - start_time))
-            print(
-                f'Train[{i}/{len(data_loader)}]: train_acc1={acc1:.3f}, train_acc5={acc5:.3f}, train_loss={loss:.6f}, lr={optimizer.param_groups[0]["lr"]}')
+            batch_stats = torch.stack([loss.detach().float() * batch_size, correct1, correct5])
+            stats += batch_stats
+            num_samples += batch_size
+            metric_logger.update(lr=optimizer.param_groups[0]['lr'])
+            if args.log_interval > 0 and i % args.log_interval == 0:
+                loss_i, acc1_i, acc5_i = (batch_stats / batch_size).tolist()
+                acc1_i, acc5_i = 100. * acc1_i, 100. * acc5_i
+                print(
+                    f'Train[{i}/{len(data_loader)}]: train_acc1={acc1_i:.3f}, train_acc5={acc5_i:.3f}, train_loss={loss_i:.6f}, lr={optimizer.param_groups[0]["lr"]}')
         metric_logger.synchronize_between_processes()
-        train_loss, train_acc1, train_acc5 = metric_logger.loss.global_avg, metric_logger.acc1.global_avg, metric_logger.acc5.global_avg
+        stats = utils.reduce_tensor_across_processes(torch.cat([stats, stats.new_tensor([num_samples])]))
+        loss_sum, correct1, correct5, num_samples = stats.tolist()
+        train_loss, train_acc1, train_acc5 = loss_sum / num_samples, 100. * correct1 / num_samples, 100. * correct5 / num_samples
         print(
-            f'Train: train_acc1={train_acc1:.3f}, train_acc5={train_acc5:.3f}, train_loss={train_loss:.6f}, samples/s={metric_logger.meters["img/s"]}, lr={metric_logger.lr.value}')
+            f'Train: train_acc1={train_acc1:.3f}, train_acc5={train_acc5:.3f}, train_loss={train_loss:.6f}, samples/s={num_samples / (time.time() - start_time):.3f}, lr={metric_logger.lr.value}')
         return train_loss, train_acc1, train_acc5
 
     @torch.no_grad()
@@ -281,22 +362,22 @@ class Trainer(object):
         metric_logger = utils.MetricLogger(delimiter=' ')
         header = f'Test: {log_suffix}'
 
+        stats = torch.zeros(3, device=device)
         num_processed_samples = 0
         start_time = time.time()
         with torch.inference_mode():
-            for img, target in metric_logger.log_every(data_loader, -1, header):
-                img = img.to(device, non_blocking=True)
-                target = target.to(device, non_blocking=True)
-                img = self.preprocess_test_sample(args, img)
-                output = self.process_model_output(args, model(img))
-                loss = self.cal_loss(args, criterion, output, target)
+            prefetcher = utils.CUDAPrefetcher(data_loader, device, self.test_gpu_transform)
+            for img, target in metric_logger.log_every(prefetcher, -1, header):
+                with torch.autocast('cuda', dtype=self.amp_dtype, enabled=args.amp):
+                    img = self.preprocess_test_sample(args, img)
+                    output = self.process_model_output(args, model(img))
+                    # test targets are hard labels, so no one-hot is needed
+                    loss = criterion(output.mean(0) if args.criterion == 'tet' else output, target)
 
-                acc1, acc5 = self.cal_acc1_acc5(output, target)
+                correct1, correct5 = self.cal_acc1_acc5(args, output, target)
 
                 batch_size = target.shape[0]
-                metric_logger.update(loss=loss.item())
-                metric_logger.meters['acc1'].update(acc1.item(), n=batch_size)
-                metric_logger.meters['acc5'].update(acc5.item(), n=batch_size)
+                stats += torch.stack([loss.float() * batch_size, correct1, correct5])
                 num_processed_samples += batch_size
                 functional.reset_net(model)
 
@@ -313,30 +394,41 @@ class Trainer(object):
                 "Setting the world size to 1 is always a safe bet."
             )
 
-        metric_logger.synchronize_between_processes()
+        stats = utils.reduce_tensor_across_processes(stats)
 
-        test_loss, test_acc1, test_acc5 = metric_logger.loss.global_avg, metric_logger.acc1.global_avg, metric_logger.acc5.global_avg
+        loss_sum, correct1, correct5 = stats.tolist()
+        num_samples = int(num_processed_samples)
+        test_loss, test_acc1, test_acc5 = loss_sum / num_samples, 100. * correct1 / num_samples, 100. * correct5 / num_samples
         print(
             f'Test: test_acc1={test_acc1:.3f}, test_acc5={test_acc5:.3f}, test_loss={test_loss:.6f}, samples/s={num_processed_samples / (time.time() - start_time):.3f}')
 
         return test_loss, test_acc1, test_acc5
 
     def preprocess_train_sample(self, args, x):
-        x = x.unsqueeze(0).repeat(args.T, 1, 1, 1, 1)
+        # direct encoding: every time-step sees the same frame. expand only defers the copy: the first
+        # layer's flatten(0, 1) still materializes the full [T * B, ...] input, so traffic matches repeat
+        x = x.unsqueeze(0).expand(args.T, -1, -1, -1, -1)
         return x
 
     def preprocess_test_sample(self, args, x):
-        x = x.unsqueeze(0).repeat(args.T, 1, 1, 1, 1)
+        x = x.unsqueeze(0).expand(args.T, -1, -1, -1, -1)
         return x
 
     def process_model_output(self, args, y):
         return y.mean(0) if args.criterion != 'tet' else y
 
-    def cal_acc1_acc5(self, output, target):
+    @torch.no_grad()
+    def cal_acc1_acc5(self, args, output, target):
+        # number of top-1 / top-5 hits in the batch, left on device
         if args.criterion == 'tet':
             output = output.mean(0)
-        acc1, acc5 = utils.accuracy(output, target, topk=(1, 5))
-        return acc1, acc5
+        if target.ndim == 2:
+            target = target.argmax(dim=1)
+        _, pred = output.topk(min(5, output.shape[-1]), dim=1)
+        correct = pred.eq(target.view(-1, 1))
+        correct1 = correct[:, 0].sum(dtype=torch.float32)
+        correct5 = correct.any(dim=1).sum(dtype=torch.float32)
+        return correct1, correct5
 
     def load_data(self, args):
         if args.data == 'imagenet':
@@ -352,12 +444,44 @@ class Trainer(object):
         config.num_classes = num_classes
         model = model_dict['model'](**dict(config))
         functional.set_step_mode(model, 'm')
+        # fall back to the torch backend when the installed spikingjelly ships no triton kernels
+        lif_nodes = [m for m in model.modules() if isinstance(m, neuron.LIFNode)]
         if args.cupy:
             functional.set_backend(model, 'cupy')
+        elif torch.cuda.is_available() and lif_nodes and 'triton' in lif_nodes[0].supported_backends:
+            functional.set_backend(model, 'triton', instance=neuron.LIFNode)
         num_params = utils.count_parameters(model)
         print("Total Parameter: \t%2.1fM" % num_params)
         return model
 
+    def native_bf16_supported(self):
+        if not torch.cuda.is_available():
+            return False
+        # since torch 2.4 the default also reports emulated bf16, which is true on V100 / T4
+        try:
+            return torch.cuda.is_bf16_supported(including_emulation=False)
+        except TypeError:
+            return torch.cuda.is_bf16_supported()
+
+    def compile_model(self, args, model):
+        torch_version = tuple(int(v) for v in torch.__version__.split('+')[0].split('.')[:2])
+        if torch_version < (2, 1):
+            warnings.warn(f'--compile needs torch>=2.1, got {torch.__version__}; running eagerly.')
+            return model
+        if args.cupy:
+            warnings.warn('--compile is not supported with the cupy backend; running eagerly.')
+            return model
+        if args.record_fire_rate:
+            warnings.warn('--compile is disabled while recording fire rates with forward hooks.')
+            return model
+        return torch.compile(model, mode=args.compile_mode, fullgraph=False, dynamic=False)
+
+    def get_optimizer_impl_kwargs(self, args, optimizer_cls):
+        # fused needs every parameter on CUDA and a torch version whose optimizer supports it
+        if args.device.startswith('cuda') and 'fused' in inspect.signature(optimizer_cls).parameters:
+            return {'fused': True}
+        return {'foreach': True}
+
     def set_optimizer(self, args, parameters):
         opt_name = args.opt.lower()
         if opt_name == 'sgd':
@@ -365,21 +489,24 @@ class Trainer(object):
                 parameters,
                 lr=args.lr,
                 momentum=args.momentum,
-                weight_decay=args.weight_decay
+                weight_decay=args.weight_decay,
+                **self.get_optimizer_impl_kwargs(args, torch.optim.SGD)
             )
         elif opt_name == 'adam':
             optimizer = torch.optim.Adam(
                 parameters,
                 lr=args.lr,
                 weight_decay=args.weight_decay,
-                betas=args.betas
+                betas=args.betas,
+                **self.get_optimizer_impl_kwargs(args, torch.optim.Adam)
             )
         elif opt_name == 'adamw':
             optimizer = torch.optim.AdamW(
                 parameters,
                 lr=args.lr,
                 weight_decay=args.weight_decay,
-                betas=args.betas
+                betas=args.betas,
+                **self.get_optimizer_impl_kwargs(args, torch.optim.AdamW)
             )
         else:
             raise NotImplementedError(f'Not supported optimizer {args.opt}')
@@ -434,7 +561,10 @@ class Trainer(object):
         if args.criterion == 'mse':
             return nn.MSELoss()
         elif args.criterion == 'ce':
-            return SoftTargetCrossEntropy()
+            mixup_active = args.mixup > 0 or args.cutmix > 0. or args.cutmix_minmax is not None
+            if mixup_active:
+                return SoftTargetCrossEntropy()
+            return nn.CrossEntropyLoss(label_smoothing=args.smoothing)
         elif args.criterion == 'tet':
             return nn.MSELoss(), nn.CrossEntropyLoss()
         else:
@@ -442,17 +572,18 @@ class Trainer(object):
 
     def cal_loss(self, args, criterion, outputs, targets):
         if args.criterion == 'mse':
-            targets = F.one_hot(targets, num_classes=args.num_classes).float().cuda()
+            if targets.ndim == 1:
+                targets = self._eye[targets]
             return criterion(outputs, targets)
         elif args.criterion == 'ce':
             return criterion(outputs, targets)
         elif args.criterion == 'tet':
             mse_loss, ce_loss = criterion
             loss = 0
-            MSE_PHI = torch.ones(args.num_classes).cuda() * 1.0
+            # built directly on the outputs' device instead of allocated on the host and copied every step
+            mse = torch.ones_like(outputs[0])
             TET_lambda = 5e-2
             for o in outputs:
-                mse = MSE_PHI.expand((len(o), args.num_classes))
                 loss += (1 - TET_lambda) * ce_loss(o, targets) + TET_lambda * mse_loss(o, mse)
             return loss
         else:
@@ -480,32 +611,26 @@ class Trainer(object):
 
     def load_CIFAR10(self, args):
         print('Loading CIFAR10 Data...')
-        dataset_train = torchvision.datasets.CIFAR10(
+        # workers only ship the raw uint8 32x32 images, crop/resize/normalize run batched on the GPU
+        dataset_train = utils.InMemoryCIFAR10(
             root=args.data_path,
             download=True,
             train=True,
-            transform=torchvision.transforms.Compose([
-                torchvision.transforms.RandomResizedCrop(224),
-                torchvision.transforms.RandomHorizontalFlip(),
-                torchvision.transforms.ToTensor(),
-                torchvision.transforms.Normalize(
-                    mean=(0.4914, 0.4822, 0.4465),
-                    std=(0.2023, 0.1994, 0.2010),
-                )
-            ]),
         )
-        dataset_test = torchvision.datasets.CIFAR10(
+        dataset_test = utils.InMemoryCIFAR10(
             root=args.data_path,
             download=True,
             train=False,
-            transform=torchvision.transforms.Compose([
-                torchvision.transforms.Resize(size=(224, 224)),
-                torchvision.transforms.ToTensor(),
-                torchvision.transforms.Normalize(
-                    mean=(0.4914, 0.4822, 0.4465),
-                    std=(0.2023, 0.1994, 0.2010),
-                )
-            ]),
+        )
+        self.train_gpu_transform = gpu_transforms.RandomResizedCropFlip(
+            size=args.input_size,
+            mean=(0.4914, 0.4822, 0.4465),
+            std=(0.2023, 0.1994, 0.2010),
+        )
+        self.test_gpu_transform = gpu_transforms.ResizeNormalize(
+            size=args.input_size,
+            mean=(0.4914, 0.4822, 0.4465),
+            std=(0.2023, 0.1994, 0.2010),
         )
 
         loader_generator = torch.Generator()
@@ -624,8 +749,13 @@ class Trainer(object):
         parser.add_argument('--model_size', default='small', type=str, choices=['tiny', 'small', 'big'])
         parser.add_argument('--T', default=4, type=int)
         parser.add_argument('--cupy', action='store_true')
+        parser.add_argument('--compile', action='store_true', help='compile the model with torch.compile')
+        parser.add_argument('--compile-mode', default='default', type=str,
+                            choices=['default', 'reduce-overhead', 'max-autotune', 'max-autotune-no-cudagraphs'])
         parser.add_argument('--device', default='cuda', type=str)
         parser.add_argument('--batch-size', default=32, type=int)
+        parser.add_argument('--eval-batch-size', default=None, type=int,
+                            help='batch size of the test loader (default: 2 * batch-size)')
         parser.add_argument('--epochs', default=90, type=int)
         parser.add_argument('--workers', default=1, type=int)
         parser.add_argument('--opt', default='sgd', type=str)
@@ -646,8 +776,12 @@ class Trainer(object):
         parser.add_argument('--world-size', default=1, type=int)
         parser.add_argument('--dist-url', default='env://', type=str)
         parser.add_argument('--seed', default=42, type=int)
+        parser.add_argument('--deterministic', action='store_true',
+                            help='use deterministic cuDNN kernels (disables cudnn.benchmark)')
         parser.add_argument('--amp', action='store_true')
         parser.add_argument('--clip-grad-norm', default=None, type=float)
+        parser.add_argument('--log-interval', default=100, type=int,
+                            help='print batch metrics every N training iterations, 0 to disable (forces a device sync)')
         parser.add_argument("--local-rank", type=int)
         parser.add_argument('--clean', action='store_true')
         parser.add_argument('--record-fire-rate', action='store_true')
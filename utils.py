@@ -1,6 +1,8 @@
 import os
+import contextlib
 import torch
 import torch.distributed as dist
+import torchvision
 from collections import defaultdict, deque
 import time
 import datetime
@@ -69,6 +71,24 @@ def save_on_master(*args, **kwargs):
         torch.save(*args, **kwargs)
 
 
+def state_to_cpu(obj):
+    """
+    Recursively copy every tensor in a (nested) state dict to the host, so it can be
+    serialized while training keeps updating the originals
+    """
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        out = type(obj)((k, state_to_cpu(v)) for k, v in obj.items())
+        # nn.Module.state_dict() attaches per-module versions that load_state_dict uses for migrations
+        if hasattr(obj, "_metadata"):
+            out._metadata = obj._metadata
+        return out
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(state_to_cpu(v) for v in obj)
+    return obj
+
+
 def reduce_across_processes(val):
     if not is_dist_avail_and_initialized():
         # nothing to sync, but we still convert to tensor for consistency with the distributed case.
@@ -80,23 +100,14 @@ def reduce_across_processes(val):
     return t
 
 
-def accuracy(output, target, topk=(1,)):
-    """Computes the accuracy over the k top predictions for the specified values of k"""
-    with torch.inference_mode():
-        maxk = max(topk)
-        batch_size = target.size(0)
-        if target.ndim == 2:
-            target = target.max(dim=1)[1]
-
-        _, pred = output.topk(maxk, 1, True, True)
-        pred = pred.t()
-        correct = pred.eq(target[None])
+def reduce_tensor_across_processes(t):
+    if not is_dist_avail_and_initialized():
+        return t
 
-        res = []
-        for k in topk:
-            correct_k = correct[:k].flatten().sum(dtype=torch.float32)
-            res.append(correct_k * (100.0 / batch_size))
-        return res
+    t = t.clone()
+    dist.barrier()
+    dist.all_reduce(t)
+    return t
 
 
 def cal_fire_rate(s_seq):
@@ -163,6 +174,61 @@ def fine_tune_state_dict(model_state_dict, fine_tune_layer):
     return model_state_dict
 
 
+class InMemoryCIFAR10(torchvision.datasets.CIFAR10):
+    """CIFAR10 decoded once into a shared-memory uint8 [N, 3, 32, 32] tensor.
+    __getitem__ is a plain index with no PIL round-trip; conversion to float and
+    augmentation happen batched on the GPU.
+    """
+
+    def __init__(self, root, train=True, download=False):
+        super().__init__(root=root, train=train, download=download)
+        self.data = torch.from_numpy(self.data).permute(0, 3, 1, 2).contiguous().share_memory_()
+        self.targets = torch.tensor(self.targets).share_memory_()
+
+    def __getitem__(self, index):
+        return self.data[index], self.targets[index]
+
+
+class CUDAPrefetcher:
+    """Copy (and optionally transform) the next batch on a side CUDA stream
+    while the current batch is being processed on the default stream.
+    """
+
+    def __init__(self, loader, device, transform=None):
+        self.loader = loader
+        self.device = device
+        self.transform = transform
+        self.stream = torch.cuda.Stream(device) if device.type == "cuda" else None
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __iter__(self):
+        loader_iter = iter(self.loader)
+        batch = self._preload(loader_iter)
+        while batch is not None:
+            if self.stream is not None:
+                current_stream = torch.cuda.current_stream(self.device)
+                current_stream.wait_stream(self.stream)
+                for t in batch:
+                    t.record_stream(current_stream)
+            next_batch = self._preload(loader_iter)
+            yield batch
+            batch = next_batch
+
+    def _preload(self, loader_iter):
+        try:
+            img, target = next(loader_iter)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(self.stream) if self.stream is not None else contextlib.nullcontext():
+            img = img.to(self.device, non_blocking=True)
+            target = target.to(self.device, non_blocking=True)
+            if self.transform is not None:
+                img = self.transform(img)
+        return img, target
+
+
 class SmoothedValue:
     """Track a series of values and provide access to smoothed values over a
     window or the global series average.